@@ -1,26 +1,71 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
-import json, os, random, math
+import json, os, pickle, random, math
 from collections import deque
+from operator import itemgetter
 from matplotlib import animation
 
-STORY_FILE = "story_progress.json"
+PROGRESS_FILE = "story_progress.pkl"
+STORY_FILE = "story_progress.json"  # pre-pickle save format, only read to migrate old progress
+EXPORT_FILE = "story_export.json"  # human-readable copy written by "Export JSON"; never loaded
+HISTORY_LIMIT = 256  # most recent steps kept for backtracking
+
+# scoring weights, shared by SimpleAIAdvisor.score_choice and _score_kernel
+W_REWARD = 1.1
+W_RISK = 1.2
+W_EMOTION = 1.0
+W_NOVELTY = 1.3
+W_OBSERVED = 0.2
+NOISE = 0.3  # exploration noise is uniform in [-NOISE, NOISE]
+
+# emotion preference: ideal is around 6-8 (engaging but not unstable). Use gaussian.
+# emotion is an integer in 1-10, so tabulate it once instead of calling exp per score.
+_EMOTION_PREF = tuple(math.exp(-((e - 7) ** 2) / (2 * (2.0 ** 2))) for e in range(11))
+_EMOTION_PREF_ARR = np.array(_EMOTION_PREF)
+
+def _score_kernel(rewards, risks, emotions, novelty, observed, noise):
+    """SimpleAIAdvisor.score_choice over arrays of candidates."""
+    return (W_REWARD * rewards - W_RISK * risks + W_EMOTION * _EMOTION_PREF_ARR[emotions]
+            + W_NOVELTY * novelty + W_OBSERVED * observed + noise)
 
 # ------------------ Data Management ------------------
 def load_story():
+    if os.path.exists(PROGRESS_FILE):
+        with open(PROGRESS_FILE, "rb") as f:
+            return pickle.load(f)
     if not os.path.exists(STORY_FILE):
         return {"current_node": "start", "visited": [], "history": [], "stats": {}}
     with open(STORY_FILE, "r") as f:
         return json.load(f)
 
 def save_story(data):
-    with open(STORY_FILE, "w") as f:
+    with open(PROGRESS_FILE, "wb") as f:
+        pickle.dump(data, f, protocol=5)
+
+def export_story(data):
+    with open(EXPORT_FILE, "w") as f:
         json.dump(data, f, indent=4)
 
 # ------------------ AI Story Generator ------------------
 class AdaptiveStoryGraph:
+    OPENINGS = (
+        "You sense something unusual.",
+        "A chill runs down your spine.",
+        "The air feels charged with possibility.",
+        "You spot a glimmer of something valuable.",
+        "A figure appears and gestures toward you."
+    )
+    ENDING_LINES = (
+        "You find peace and safety at last.",
+        "You uncover the hidden truth of your journey.",
+        "You vanish into the unknown, your fate sealed.",
+        "You escape the danger, but the memory lingers.",
+        "You realize this was only the beginning..."
+    )
+
     def __init__(self):
         self.G = nx.DiGraph()
         self.theme = random.choice(["mystery", "adventure", "sci-fi", "fantasy", "survival"])
@@ -35,39 +80,68 @@ class AdaptiveStoryGraph:
             "fantasy": "You awaken in an enchanted forest filled with glowing runes.",
             "survival": "You wake up after a plane crash in a wild jungle."
         }
-        self.G.add_node("start", text=start_texts[self.theme], attributes=self.random_attributes())
+        # Lay out node names and attributes first (in insertion order), then write all texts
+        names, node_attrs, endings, edges = [], [], [], []
+
+        def plan_node(name, ending=False):
+            names.append(name)
+            node_attrs.append(self.random_attributes())
+            endings.append(ending)
+
+        plan_node("start")
 
         # Node generation settings
         num_branches = random.randint(3, 6)
         for i in range(1, num_branches + 1):
             n = f"choice_{i}"
-            attrs = self.random_attributes()
-            text = self.compose_text_for_node(n, attrs)
-            self.G.add_node(n, text=text, attributes=attrs)
-            self.G.add_edge("start", n)
+            plan_node(n)
+            edges.append(("start", n))
 
             # Generate secondary branches
             for j in range(random.randint(1, 3)):
                 m = f"{n}_path{j}"
-                attrs_m = self.random_attributes()
-                next_text = self.compose_text_for_node(m, attrs_m)
-                self.G.add_node(m, text=next_text, attributes=attrs_m)
-                self.G.add_edge(n, m)
+                plan_node(m)
+                edges.append((n, m))
 
                 # Occasionally create an ending
                 if random.random() < 0.35:
                     e = f"{m}_end"
-                    attrs_e = self.random_attributes()
-                    end_text = self.compose_text_for_node(e, attrs_e, ending=True)
-                    self.G.add_node(e, text=end_text, attributes=attrs_e)
-                    self.G.add_edge(m, e)
+                    plan_node(e, ending=True)
+                    edges.append((m, e))
+
+        # pick every opening / ending line in one go rather than once per node
+        openings = random.choices(self.OPENINGS, k=len(names))
+        ending_lines = iter(random.choices(self.ENDING_LINES, k=sum(endings)))
+
+        self.G.add_node("start", text=start_texts[self.theme])
+        for k in range(1, len(names)):
+            line = next(ending_lines) if endings[k] else openings[k]
+            self.G.add_node(names[k], text=self.compose_text_for_node(node_attrs[k], line, endings[k]))
+        self.G.add_edges_from(edges)
 
         # Add some random cross-links to make it adaptive
-        nodes = list(self.G.nodes())
+        eligible = [n for n in self.G.nodes if n != "start"]
+        edge_set = set(self.G.edges())
         for _ in range(random.randint(3, 6)):
-            a, b = random.sample(nodes, 2)
-            if a != "start" and b != "start" and a != b and not self.G.has_edge(a, b):
+            a, b = random.choice(eligible), random.choice(eligible)
+            if a != b and (a, b) not in edge_set:
                 self.G.add_edge(a, b)
+                edge_set.add((a, b))
+
+        # The graph is fixed from here on, so cache lookups as plain dicts
+        self.nodes_cached = tuple(self.G.nodes())
+        self.edges_cached = tuple(self.G.edges())
+        self._succ = {n: tuple(self.G.successors(n)) for n in self.G}
+        self._text = {n: d["text"] for n, d in self.G.nodes(data=True)}
+        self._display = {n: t if len(t) <= 80 else t[:77] + "..." for n, t in self._text.items()}
+        self._attrs_arrays(names, node_attrs)
+
+    def _attrs_arrays(self, names, node_attrs):
+        """Store node attributes as one array per attribute, indexed via self._nidx."""
+        self._nidx = {n: i for i, n in enumerate(names)}
+        self.emotion_arr = np.array([a["emotion"] for a in node_attrs], dtype=np.int8)
+        self.risk_arr = np.array([a["risk"] for a in node_attrs], dtype=np.int8)
+        self.reward_arr = np.array([a["reward"] for a in node_attrs], dtype=np.int8)
 
     def random_attributes(self):
         # emotion: how emotionally charged the node is (1-10)
@@ -79,33 +153,18 @@ class AdaptiveStoryGraph:
             "reward": random.randint(0, 5)
         }
 
-    def compose_text_for_node(self, node_name, attrs, ending=False):
-        """Create a short text that depends on the attributes to feel AI-generated."""
+    def compose_text_for_node(self, attrs, line, ending=False):
+        """Create a short text that depends on the attributes to feel AI-generated.
+
+        line is the opening (or, for endings, the closing) sentence already picked for the node.
+        """
         emotion = attrs["emotion"]
         risk = attrs["risk"]
         reward = attrs["reward"]
 
-        openings = [
-            "You sense something unusual.",
-            "A chill runs down your spine.",
-            "The air feels charged with possibility.",
-            "You spot a glimmer of something valuable.",
-            "A figure appears and gestures toward you."
-        ]
-        ending_lines = [
-            "You find peace and safety at last.",
-            "You uncover the hidden truth of your journey.",
-            "You vanish into the unknown, your fate sealed.",
-            "You escape the danger, but the memory lingers.",
-            "You realize this was only the beginning..."
-        ]
-
-        base = random.choice(openings)
-        detail = f" (emotion {emotion}, risk {risk}, reward {reward})"
-
         # Adjust flavor by emotion and risk
         if ending:
-            return f"{random.choice(ending_lines)}{detail}"
+            return f"{line} (emotion {emotion}, risk {risk}, reward {reward})"
         tone = ""
         if emotion >= 8:
             tone = " Your heart races; the scene feels intense."
@@ -116,16 +175,25 @@ class AdaptiveStoryGraph:
         elif reward >= 4:
             tone += " This could be a big opportunity."
 
-        return base + tone + detail
+        return f"{line}{tone} (emotion {emotion}, risk {risk}, reward {reward})"
 
     def get_choices(self, node):
-        return list(self.G.successors(node))
+        return self._succ[node]
 
     def get_text(self, node):
-        return self.G.nodes[node]["text"]
+        return self._text[node]
+
+    def get_display_text(self, node):
+        """Node text truncated to fit on a choice button."""
+        return self._display[node]
 
     def get_node_attributes(self, node):
-        return self.G.nodes[node].get("attributes", {"emotion":5,"risk":2,"reward":2})
+        i = self._nidx[node]
+        return {
+            "emotion": int(self.emotion_arr[i]),
+            "risk": int(self.risk_arr[i]),
+            "reward": int(self.reward_arr[i])
+        }
 
 # ------------------ AI Recommendation Engine ------------------
 class SimpleAIAdvisor:
@@ -134,33 +202,38 @@ class SimpleAIAdvisor:
     The scoring function uses attributes (emotion, risk, reward), novelty (visited?), and a mild randomness.
     """
 
-    def __init__(self, graph: AdaptiveStoryGraph, story_data: dict):
+    def __init__(self, graph: AdaptiveStoryGraph, story_data: dict, visited: set):
         self.graph = graph
         self.story_data = story_data
+        self.visited = visited
+        self.rng = np.random.default_rng()
+        self._refill_noise()
+
+    def _refill_noise(self):
+        # exploration noise is drawn in batches; score_choice consumes it one value at a time
+        self._noise = self.rng.uniform(-NOISE, NOISE, size=4096).tolist()
+        self._ni = 0
 
     def score_choice(self, node, current_node):
         """
         Score = weighted sum:
-         + reward * w_reward
-         - risk * w_risk
+         + reward * W_REWARD
+         - risk * W_RISK
          + emotion_bias (prefers moderate-high emotion)
          + novelty bonus if not visited
          - distance penalty if node is deeper than some threshold (we don't compute depth here; simple)
          + small random exploration noise
         """
-        attrs = self.graph.get_node_attributes(node)
-        reward = attrs.get("reward", 0)
-        risk = attrs.get("risk", 0)
-        emotion = attrs.get("emotion", 5)
+        g = self.graph
+        i = g._nidx[node]
+        reward = g.reward_arr[i]
+        risk = g.risk_arr[i]
+        emotion = g.emotion_arr[i]
 
-        w_reward = 1.1
-        w_risk = 1.2
-        # emotion preference: ideal is around 6-8 (engaging but not unstable). Use gaussian.
-        emotion_pref = math.exp(-((emotion - 7) ** 2) / (2 * (2.0 ** 2)))  # normalized-ish
+        emotion_pref = _EMOTION_PREF[emotion]  # normalized-ish
 
         # novelty
-        visited = set(self.story_data.get("visited", []))
-        novelty = 1.0 if node not in visited else 0.0
+        novelty = 1.0 if node not in self.visited else 0.0
 
         # basic usage stats if present (prefer nodes with higher past observed reward)
         stats = self.story_data.get("stats", {})
@@ -168,23 +241,37 @@ class SimpleAIAdvisor:
         observed_reward = node_stat.get("observed_reward", 0)
 
         # combine
-        base_score = w_reward * reward - w_risk * risk
-        score = base_score + 1.0 * emotion_pref + 1.3 * novelty + 0.2 * observed_reward
+        base_score = W_REWARD * reward - W_RISK * risk
+        score = base_score + W_EMOTION * emotion_pref + W_NOVELTY * novelty + W_OBSERVED * observed_reward
 
         # exploration noise (small)
-        noise = random.uniform(-0.3, 0.3)
+        if self._ni == len(self._noise):
+            self._refill_noise()
+        noise = self._noise[self._ni]
+        self._ni += 1
         return score + noise
 
     def rank_choices(self, choices, current_node):
-        scored = [(c, self.score_choice(c, current_node)) for c in choices]
-        scored.sort(key=lambda x: x[1], reverse=True)
-        return scored
+        """Same scoring as score_choice, computed for all choices at once."""
+        g = self.graph
+        idx = np.array([g._nidx[c] for c in choices], dtype=np.intp)
+        stats = self.story_data.get("stats", {})
+        novelty = np.array([0.0 if c in self.visited else 1.0 for c in choices])
+        observed = np.array([stats.get(c, {}).get("observed_reward", 0) for c in choices], dtype=np.float64)
+
+        scores = _score_kernel(g.reward_arr[idx], g.risk_arr[idx], g.emotion_arr[idx],
+                               novelty, observed, self.rng.uniform(-NOISE, NOISE, size=idx.size))
+        order = np.argsort(-scores)
+        return [(choices[i], float(scores[i])) for i in order]
+
+    def best_choice(self, choices, current_node):
+        """Single pass over choices keeping only the top-scoring one (no ranking list)."""
+        return max(((c, self.score_choice(c, current_node)) for c in choices), key=itemgetter(1))
 
     def recommend(self, choices, current_node):
         if not choices:
             return None, None
-        ranked = self.rank_choices(choices, current_node)
-        best_node, best_score = ranked[0]
+        best_node, best_score = self.best_choice(choices, current_node)
         # create simple explanation
         explanation = self.explain_choice(best_node, best_score)
         return best_node, explanation
@@ -198,7 +285,7 @@ class SimpleAIAdvisor:
             f"Emotion={attrs.get('emotion')}"
         ]
         # novelty
-        if node not in self.story_data.get("visited", []):
+        if node not in self.visited:
             parts.append("Novelty bonus: not visited")
         # observed reward
         observed = self.story_data.get("stats", {}).get(node, {}).get("observed_reward", 0)
@@ -206,21 +293,24 @@ class SimpleAIAdvisor:
             parts.append(f"Observed reward={observed}")
         return "; ".join(parts)
 
-# ------------------ Hierarchical Layout (unchanged) ------------------
-def hierarchy_layout(G, root='start', width=2.0, vert_gap=1.3, vert_loc=0):
+# ------------------ Hierarchical Layout ------------------
+def hierarchy_layout(G, root='start', width=2.0, vert_gap=1.3, vert_loc=0, successors=None):
+    # successors: optional node -> children lookup (e.g. a cached adjacency) used instead of G.successors
+    if successors is None:
+        successors = G.successors
+    # group nodes into layers while the BFS discovers them
     levels = {root: 0}
+    layer_nodes = {0: [root]}
     queue = deque([root])
     while queue:
         v = queue.popleft()
-        for child in G.successors(v):
+        d = levels[v] + 1
+        for child in successors(v):
             if child not in levels:
-                levels[child] = levels[v] + 1
+                levels[child] = d
+                layer_nodes.setdefault(d, []).append(child)
                 queue.append(child)
 
-    layer_nodes = {}
-    for node, level in levels.items():
-        layer_nodes.setdefault(level, []).append(node)
-
     pos = {}
     for depth, nodes in layer_nodes.items():
         dx = width / (len(nodes) + 1)
@@ -237,17 +327,25 @@ class StoryApp(tk.Tk):
         self.config(bg="#f6f7fb")
 
         self.story_graph = AdaptiveStoryGraph()
+        self._node_ids = frozenset(self.story_graph.G.nodes())
         self.story_data = load_story()
         # init stats container if missing
         self.story_data.setdefault("stats", {})
-        self.history_stack = self.story_data.get("history", [])
+        self._visited_set = set(self.story_data.setdefault("visited", []))
+        self.history_stack = deque(self.story_data.get("history", []), maxlen=HISTORY_LIMIT)
+        # set when story_data changes; flushed once at the end of each event handler
+        self._dirty = False
+        # one advisor per story, so its noise buffer is shared by every click
+        self.advisor = SimpleAIAdvisor(self.story_graph, self.story_data, self._visited_set)
 
         self.create_ui()
         # ensure current_node is valid
         cur = self.story_data.get("current_node", "start")
-        if cur not in self.story_graph.G.nodes():
+        if cur not in self._node_ids:
             self.story_data["current_node"] = "start"
+            self._dirty = True
         self.show_story(self.story_data.get("current_node", "start"))
+        self.flush_story()
 
     def create_ui(self):
         header = tk.Frame(self, bg="#f6f7fb")
@@ -258,6 +356,7 @@ class StoryApp(tk.Tk):
         right_header.pack(side="right", padx=12)
         ttk.Button(right_header, text="🎞 Visualize", command=self.show_graph_animated).pack(side="left", padx=6)
         ttk.Button(right_header, text="🔁 New Story", command=self.restart_new_story).pack(side="left", padx=6)
+        ttk.Button(right_header, text="💾 Export JSON", command=self.export_progress).pack(side="left", padx=6)
         ttk.Button(right_header, text="Exit", command=self.quit).pack(side="left", padx=6)
 
         # Story text area
@@ -270,6 +369,10 @@ class StoryApp(tk.Tk):
         control_row.pack(fill="x", pady=(0,6))
         self.choice_frame = tk.Frame(self, bg="#f6f7fb")
         self.choice_frame.pack(pady=6)
+        # choice buttons and the ending label are reused (reconfigured) across nodes
+        self._btns = [self._make_choice_button() for _ in range(8)]
+        self.end_label = tk.Label(self.choice_frame, text="🌟 The End 🌟", font=("Arial", 14, "bold"),
+                                  bg="#f6f7fb", fg="green")
 
         ai_controls = tk.Frame(self, bg="#f6f7fb")
         ai_controls.pack(pady=6)
@@ -284,49 +387,61 @@ class StoryApp(tk.Tk):
 
     def show_story(self, node):
         # set current node in data
-        self.story_data["current_node"] = node
-        save_story(self.story_data)
+        if self.story_data.get("current_node") != node:
+            self.story_data["current_node"] = node
+            self._dirty = True
 
         self.story_text.config(text=self.story_graph.get_text(node))
         self.clear_choices()
         choices = self.story_graph.get_choices(node)
         if not choices:
-            tk.Label(self.choice_frame, text="🌟 The End 🌟", font=("Arial", 14, "bold"),
-                     bg="#f6f7fb", fg="green").pack()
+            self.end_label.pack()
             self.status_var.set("Reached an ending. Try '🔁 New Story' to explore another adventure.")
             return
 
-        # create AI advisor
-        self.advisor = SimpleAIAdvisor(self.story_graph, self.story_data)
         self.current_choices = choices  # keep for later
         self.recommendation = None
         self.recommendation_expl = None
 
         # show choices as colored buttons (tk.Button so we can change bg easily)
-        for c in choices:
-            text = self.story_graph.get_text(c)
-            truncated = text if len(text) <= 80 else text[:77] + "..."
-            btn = tk.Button(self.choice_frame, text=truncated, wraplength=700, justify="left",
-                            anchor="w", width=80, command=lambda c=c: self.next_node(c),
-                            relief="raised", padx=8, pady=6, bg="#FFF9C4")
+        while len(self._btns) < len(choices):
+            self._btns.append(self._make_choice_button())
+        for btn, c in zip(self._btns, choices):
+            btn.config(text=self.story_graph.get_display_text(c),
+                       command=lambda c=c: self.next_node(c), bg="#FFF9C4")
             btn.pack(pady=4)
             # store reference attribute on button for later highlight
             btn._node_id = c
 
         self.status_var.set(f"{len(choices)} choices available. Click '🤖 Recommend' for AI suggestion.")
 
+    def flush_story(self):
+        if self._dirty:
+            self.story_data["history"] = list(self.history_stack)
+            save_story(self.story_data)
+            self._dirty = False
+
+    def _make_choice_button(self):
+        # tk.Button so we can change bg easily; text/command are set in show_story
+        btn = tk.Button(self.choice_frame, wraplength=700, justify="left", anchor="w", width=80,
+                        relief="raised", padx=8, pady=6, bg="#FFF9C4")
+        btn._node_id = None
+        return btn
+
     def clear_choices(self):
-        for w in self.choice_frame.winfo_children():
-            w.destroy()
+        self.end_label.pack_forget()
+        for btn in self._btns:
+            btn.pack_forget()
+            btn._node_id = None
 
     def next_node(self, node, auto_record=True):
         cur = self.story_data.get("current_node", "start")
         # update history
         self.history_stack.append(cur)
         self.story_data["current_node"] = node
-        if node not in self.story_data.get("visited", []):
-            self.story_data.setdefault("visited", []).append(node)
-        self.story_data["history"] = self.history_stack
+        if node not in self._visited_set:
+            self._visited_set.add(node)
+            self.story_data["visited"].append(node)
 
         # update stats: accumulate "observed_reward" from visited nodes as simple RL signal
         stats = self.story_data.setdefault("stats", {})
@@ -337,8 +452,9 @@ class StoryApp(tk.Tk):
         node_stat["visits"] += 1
         node_stat["observed_reward"] += observed
 
-        save_story(self.story_data)
+        self._dirty = True
         self.show_story(node)
+        self.flush_story()
 
     def go_back(self):
         if not self.history_stack:
@@ -346,14 +462,12 @@ class StoryApp(tk.Tk):
             return
         prev = self.history_stack.pop()
         self.story_data["current_node"] = prev
-        self.story_data["history"] = self.history_stack
-        save_story(self.story_data)
+        self._dirty = True
         self.show_story(prev)
+        self.flush_story()
 
     # ------------------ AI Actions ------------------
     def show_recommendation(self):
-        if not hasattr(self, "advisor"):
-            self.advisor = SimpleAIAdvisor(self.story_graph, self.story_data)
         choices = getattr(self, "current_choices", [])
         cur = self.story_data.get("current_node", "start")
         best, expl = self.advisor.recommend(choices, cur)
@@ -363,8 +477,8 @@ class StoryApp(tk.Tk):
             messagebox.showinfo("Recommend", "No available choices to recommend.")
             return
         # highlight recommended button
-        for w in self.choice_frame.winfo_children():
-            if getattr(w, "_node_id", None) == best:
+        for w in self._btns:
+            if w._node_id == best:
                 w.config(bg="#7EB6FF")  # highlight color for recommendation
             else:
                 w.config(bg="#FFF9C4")
@@ -378,8 +492,6 @@ class StoryApp(tk.Tk):
 
     def auto_choose(self):
         # Use the advisor to pick one and immediately follow it
-        if not hasattr(self, "advisor"):
-            self.advisor = SimpleAIAdvisor(self.story_graph, self.story_data)
         choices = getattr(self, "current_choices", [])
         cur = self.story_data.get("current_node", "start")
         best, expl = self.advisor.recommend(choices, cur)
@@ -394,50 +506,94 @@ class StoryApp(tk.Tk):
     # ------------------ Animated Visualization ------------------
     def show_graph_animated(self):
         G = self.story_graph.G
-        pos = hierarchy_layout(G, root='start')
-        visited = set(self.story_data.get("visited", []))
+        # the graph never changes after generation, so lay it out once per story
+        pos = getattr(self.story_graph, "_layout", None)
+        if pos is None:
+            pos = hierarchy_layout(G, root='start', successors=self.story_graph.get_choices)
+            self.story_graph._layout = pos
+        visited = self._visited_set
         current = self.story_data.get("current_node", "start")
 
         fig, ax = plt.subplots(figsize=(12, 7))
-        plt.title("🤖 AI Adaptive Story Graph — Animated", fontsize=14, fontweight="bold")
+        plt.title("📘 Story Graph Progress", fontsize=14, fontweight="bold")
         plt.axis("off")
 
-        nodes = list(G.nodes())
-        edges = list(G.edges())
+        nodes = self.story_graph.nodes_cached
+
+        # an edge becomes visible on the frame that reveals its later endpoint, so order
+        # edges by that frame and keep a running count of edges visible at each frame.
+        # Like the layout, this only depends on the graph and is built once per story.
+        reveal_order = getattr(self.story_graph, "_reveal_order", None)
+        if reveal_order is None:
+            node_index = {n: i for i, n in enumerate(nodes)}
+            edges_by_tail = [[] for _ in nodes]
+            for u, v in self.story_graph.edges_cached:
+                edges_by_tail[max(node_index[u], node_index[v])].append((u, v))
+            ordered_edges = []
+            edges_upto = []
+            for tail_edges in edges_by_tail:
+                ordered_edges.extend(tail_edges)
+                edges_upto.append(len(ordered_edges))
+            reveal_order = self.story_graph._reveal_order = (ordered_edges, edges_upto)
+        ordered_edges, edges_upto = reveal_order
+
+        colors = []
+        for n in nodes:
+            if n == current:
+                colors.append("#7EB6FF")
+            elif n in visited:
+                colors.append("#A8E6CF")
+            else:
+                colors.append("#FFF9C4")
+        pos_array = np.array([pos[n] for n in nodes])
+
+        # draw every artist once (hidden), then reveal them frame by frame
+        node_artist = nx.draw_networkx_nodes(G, pos, nodelist=nodes, node_color=colors,
+                                             node_size=2300, edgecolors="black", ax=ax)
+        edge_artists = nx.draw_networkx_edges(G, pos, edgelist=ordered_edges, nodelist=nodes,
+                                              node_size=2300, arrows=True, arrowsize=12, ax=ax)
+        label_artists = nx.draw_networkx_labels(G, pos, labels={n: n for n in nodes},
+                                                font_size=8, font_weight="bold", ax=ax)
+        label_artists = [label_artists[n] for n in nodes]
+        for artist in edge_artists + label_artists:
+            artist.set_visible(False)
+        shown = {"nodes": 0, "edges": 0}
+
+        def reveal(artists, key, count):
+            # only toggle the artists between the previous and the new count
+            prev = shown[key]
+            for artist in artists[min(prev, count):max(prev, count)]:
+                artist.set_visible(count > prev)
+            shown[key] = count
 
         def update(frame):
-            ax.clear()
-            plt.axis("off")
-            plt.title("📘 Story Graph Progress", fontsize=14, fontweight="bold")
-
-            step_nodes = nodes[:min(len(nodes), frame + 1)]
-            step_edges = [e for e in edges if e[0] in step_nodes and e[1] in step_nodes]
-
-            colors = []
-            for n in step_nodes:
-                if n == current:
-                    colors.append("#7EB6FF")
-                elif n in visited:
-                    colors.append("#A8E6CF")
-                else:
-                    colors.append("#FFF9C4")
-
-            nx.draw(G.subgraph(step_nodes), pos, with_labels=True,
-                    node_color=colors, node_size=2300, font_size=8,
-                    font_weight="bold", edgecolors="black",
-                    arrows=True, arrowsize=12, ax=ax)
+            frame = min(len(nodes) - 1, frame)
+            node_artist.set_offsets(pos_array[:frame + 1])
+            node_artist.set_facecolor(colors[:frame + 1])
+            reveal(label_artists, "nodes", frame + 1)
+            reveal(edge_artists, "edges", edges_upto[frame])
 
         ani = animation.FuncAnimation(fig, update, frames=len(nodes), interval=500, repeat=False)
         plt.show()
 
+    def export_progress(self):
+        self.story_data["history"] = list(self.history_stack)
+        export_story(self.story_data)
+        self.status_var.set(f"Progress exported to {EXPORT_FILE}.")
+
     def restart_new_story(self):
-        if os.path.exists(STORY_FILE):
-            os.remove(STORY_FILE)
+        for path in (PROGRESS_FILE, STORY_FILE):
+            if os.path.exists(path):
+                os.remove(path)
         self.story_graph = AdaptiveStoryGraph()
+        self._node_ids = frozenset(self.story_graph.G.nodes())
         self.story_data = {"current_node": "start", "visited": [], "history": [], "stats": {}}
-        self.history_stack = []
-        save_story(self.story_data)
+        self._visited_set = set()
+        self.history_stack = deque(maxlen=HISTORY_LIMIT)
+        self.advisor = SimpleAIAdvisor(self.story_graph, self.story_data, self._visited_set)
+        self._dirty = True
         self.show_story("start")
+        self.flush_story()
         messagebox.showinfo("New Story", "✨ A brand new AI-generated story has been created!")
 
 # ------------------ Run ------------------